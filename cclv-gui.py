@@ -1,13 +1,17 @@
 import asyncio
+import contextlib
 import datetime
 import json
 import logging
 import random
 import sys
+import time
+from functools import lru_cache
+from operator import itemgetter
 
-import aiofiles
 import aiohttp
 import websockets
+
 from PySide6.QtCore import QThread, QObject, Signal, Slot, Qt
 from PySide6.QtWidgets import (
     QApplication,
@@ -33,6 +37,104 @@ from qfluentwidgets import (
     setThemeColor,
 )
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    if sys.platform == "win32":
+        from winloop import new_event_loop
+    else:
+        from uvloop import new_event_loop
+except ImportError:
+    new_event_loop = asyncio.new_event_loop
+
+# 서버 PING(cmd 0)에 대한 PONG 응답 프레임
+PONG_FRAME = b'{"ver":"2","cmd":10000}'
+
+# 채팅 서버 접속 메시지. 연결할 때 __CID__ 자리에 채널 ID만 채워 넣습니다.
+HANDSHAKE_TEMPLATE = json.dumps(
+    {
+        "ver": "3",
+        "cmd": 100,
+        "svcid": "game",
+        "cid": "__CID__",
+        "bdy": {
+            "uid": None,
+            "devType": 2001,
+            "accTkn": "",
+            "auth": "READ",
+        },
+        "tid": 1,
+    }
+)
+# 채널 ID별로 완성된 접속 메시지(bytes)
+HANDSHAKE_CACHE = {}
+
+# 채팅(93101), 후원(93102) 메시지 cmd
+CHAT_COMMANDS = frozenset((93101, 93102))
+DONATION_COMMAND = 93102
+
+# profile/extras JSON에서 필요한 값만 꺼내는 getter (후원 금액은 후원 메시지에만 있음)
+get_nickname = itemgetter("nickname")
+get_donation = itemgetter("payAmount", "osType")
+
+# 채팅 로그 한 줄 포맷 (후원 / 일반)
+DONATION_FORMAT = "[%s] %s%s (%s원 후원): %s"
+CHAT_FORMAT = "[%s] %s%s: %s"
+
+# 라이브 상태(채팅 채널 변경) 확인 주기 (초)
+LIVE_STATUS_INTERVAL = 60
+
+
+@lru_cache(maxsize=4096)
+def format_time(sec):
+    """초 단위 타임스탬프를 채팅 시간 문자열로 변환합니다. (같은 초의 채팅은 캐시 사용)"""
+    return time.strftime("%H:%M:%S", time.localtime(sec))
+
+
+def format_chat(msg_time_ms, nickname, os_type, pay_amount, msg):
+    """채팅 한 건을 채팅 한 줄로 변환합니다."""
+    formatted_time = format_time(msg_time_ms // 1000)
+    os_info = f" ({os_type})" if os_type else ""
+    if pay_amount and pay_amount > 0:
+        return DONATION_FORMAT % (formatted_time, nickname, os_info, pay_amount, msg)
+    return CHAT_FORMAT % (formatted_time, nickname, os_info, msg)
+
+
+def handshake_frame(chat_channel_id):
+    """채널별 접속 메시지를 bytes로 만들어 두고, 재연결할 때는 캐시를 사용합니다."""
+    payload = HANDSHAKE_CACHE.get(chat_channel_id)
+    if payload is None:
+        payload = HANDSHAKE_TEMPLATE.replace("__CID__", chat_channel_id, 1).encode()
+        HANDSHAKE_CACHE[chat_channel_id] = payload
+    return payload
+
+
+class ChatLogWriter:
+    """
+    채팅 로그를 파일 버퍼에 쌓아 두었다가 주기적으로 디스크에 기록하는 클래스
+    """
+
+    def __init__(self, file_stream, interval=0.25):
+        # file_stream: open(..., "ab", buffering=...)로 연 버퍼드 바이너리 파일
+        self.file_stream = file_stream
+        self.interval = interval
+
+    def write(self, line):
+        # 메모리 버퍼에 복사만 하므로 이벤트 루프를 막지 않습니다.
+        self.file_stream.write(line.encode())
+
+    async def flush(self):
+        await asyncio.to_thread(self.file_stream.flush)
+
+    async def run(self):
+        """interval마다 버퍼에 쌓인 로그를 파일에 기록합니다."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
 
 class Worker(QObject):
     new_message = Signal(str)
@@ -44,15 +146,29 @@ class Worker(QObject):
         self.channel_id = channel_id
         self.save_log = save_log
         self._is_running = True
+        self._loop = None
+        self._stop_event = None
+        self._pending = []
+        self._session = None
+        self._websocket = None
+        self._chat_channel_id = None
+        # 채팅 채널 변경으로 웹소켓을 일부러 닫았는지 여부 (오류로 보지 않음)
+        self._reconnecting = False
 
     def stop(self):
         self._is_running = False
         self.new_message.emit("연결 종료 중...")
+        # 워커 스레드의 이벤트 루프에서 대기 중인 수신을 바로 깨웁니다.
+        if self._loop:
+            try:
+                self._loop.call_soon_threadsafe(self._stop_event.set)
+            except RuntimeError:
+                pass  # 이벤트 루프가 이미 종료됨
 
     @Slot()
     def run(self):
         try:
-            asyncio.run(self.main())
+            asyncio.run(self.main(), loop_factory=new_event_loop)
         except Exception as e:
             if self._is_running:
                 self.error.emit(f"작업 실행 중 오류 발생: {e}")
@@ -60,20 +176,34 @@ class Worker(QObject):
             self.finished.emit()
 
     async def main(self):
+        # stop()은 _loop가 보이면 _stop_event를 쓰므로, 이벤트를 먼저 만들고 루프를 마지막에 공개합니다.
+        self._stop_event = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+
+        # 라이브 상태 API는 한 호스트뿐이므로 세션(커넥션)을 워커가 끝날 때까지 재사용합니다.
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=4, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+        try:
+            await self.collect_chats()
+        finally:
+            await self._session.close()
+
+    async def fetch_chat_channel_id(self):
         api_url = f"https://api.chzzk.naver.com/polling/v2/channels/{self.channel_id}/live-status"
+        async with self._session.get(api_url) as response:
+            response.raise_for_status()
+            data = await response.json()
+            content = data.get("content") or {}
+            return content.get("chatChannelId")
+
+    async def collect_chats(self):
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    content = data.get("content", {})
-                    chat_channel_id = content.get("chatChannelId")
-
-                    if not chat_channel_id:
-                        self.error.emit(
-                            "라이브 중이 아니거나, 유효하지 않은 채널 ID입니다."
-                        )
-                        return
+            self._chat_channel_id = await self.fetch_chat_channel_id()
+            if not self._chat_channel_id:
+                self.error.emit("라이브 중이 아니거나, 유효하지 않은 채널 ID입니다.")
+                return
         except aiohttp.ClientError as e:
             self.error.emit(f"API 요청 오류: {e}")
             return
@@ -81,107 +211,169 @@ class Worker(QObject):
             self.error.emit(f"채널 정보 확인 오류: {e}")
             return
 
-        self.new_message.emit(f"채팅 채널 ID 확인: {chat_channel_id}")
+        self.new_message.emit(f"채팅 채널 ID 확인: {self._chat_channel_id}")
 
-        file_stream = None
+        log_file = contextlib.nullcontext()
         if self.save_log:
             filename = f"chzzk_chat_{self.channel_id}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
             self.new_message.emit(f"채팅 로그를 '{filename}' 파일에 저장합니다.")
-            file_stream = await aiofiles.open(filename, "a", encoding="utf-8")
+            # 파일 열기는 디스크 I/O이므로 이벤트 루프를 막지 않게 스레드에서 엽니다.
+            log_file = await asyncio.to_thread(open, filename, "ab", buffering=1 << 20)
 
-        try:
-            while self._is_running:
-                await self.connect_to_websocket(chat_channel_id, file_stream)
-                if not self._is_running:
-                    break
-                self.new_message.emit("5초 후 재연결을 시도합니다...")
-                await asyncio.sleep(5)
-        finally:
+        with log_file as file_stream:
+            emit_task = asyncio.create_task(self.emit_pending())
+            refresh_task = asyncio.create_task(self.refresh_live_status())
+            log_writer = None
             if file_stream:
-                await file_stream.close()
+                log_writer = ChatLogWriter(file_stream)
+                flush_task = asyncio.create_task(log_writer.run())
 
-    async def connect_to_websocket(self, chat_channel_id, file_stream):
+            try:
+                while self._is_running:
+                    await self.connect_to_websocket(self._chat_channel_id, log_writer)
+                    if not self._is_running:
+                        break
+                    if self._reconnecting:
+                        # 채널 변경에 따른 재연결은 기다리지 않고 바로 접속합니다.
+                        self._reconnecting = False
+                        continue
+                    self.new_message.emit("5초 후 재연결을 시도합니다...")
+                    try:
+                        await asyncio.wait_for(self._stop_event.wait(), timeout=5)
+                    except TimeoutError:
+                        pass
+            finally:
+                emit_task.cancel()
+                refresh_task.cancel()
+                self.flush_pending()
+                if log_writer:
+                    flush_task.cancel()
+                    await log_writer.flush()
+
+    async def refresh_live_status(self):
+        """라이브 상태를 주기적으로 확인하고, 채팅 채널이 바뀌면 다시 연결합니다."""
+        while True:
+            await asyncio.sleep(LIVE_STATUS_INTERVAL)
+            try:
+                chat_channel_id = await self.fetch_chat_channel_id()
+            except (aiohttp.ClientError, TimeoutError, ValueError, KeyError) as e:
+                self.new_message.emit(f"라이브 상태 확인 실패: {e}")
+                continue
+
+            if chat_channel_id and chat_channel_id != self._chat_channel_id:
+                self._chat_channel_id = chat_channel_id
+                self.new_message.emit("채팅 채널이 변경되어 다시 연결합니다.")
+                if self._websocket:
+                    self._reconnecting = True
+                    await self._websocket.close()
+
+    async def connect_to_websocket(self, chat_channel_id, log_writer):
         uri = f"wss://kr-ss{random.randint(1, 10)}.chat.naver.com/chat"
         try:
             async with websockets.connect(
-                uri, origin="https://chzzk.naver.com"
+                uri,
+                origin="https://chzzk.naver.com",
+                # 연결 유지는 서버 PING(cmd 0)에 직접 응답하므로 라이브러리 ping은 끕니다.
+                ping_interval=None,
+                ping_timeout=None,
+                # 작은 JSON 텍스트 프레임뿐이므로 프레임마다 zlib 압축 해제를 하지 않습니다.
+                compression=None,
+                max_queue=256,
+                max_size=2**20,
             ) as websocket:
+                self._websocket = websocket
                 self.new_message.emit("웹소켓 연결 성공.")
-                await websocket.send(
-                    json.dumps(
-                        {
-                            "ver": "3",
-                            "cmd": 100,
-                            "svcid": "game",
-                            "cid": chat_channel_id,
-                            "bdy": {
-                                "uid": None,
-                                "devType": 2001,
-                                "accTkn": "",
-                                "auth": "READ",
-                            },
-                            "tid": 1,
-                        }
-                    )
-                )
-
-                while self._is_running:
-                    try:
-                        message_str = await asyncio.wait_for(
-                            websocket.recv(), timeout=1.0
-                        )
-                    except asyncio.TimeoutError:
-                        continue
+                await websocket.send(handshake_frame(chat_channel_id), text=True)
 
-                    message = json.loads(message_str)
+                # 중지 요청이 오면 수신 루프를 취소합니다. (메시지마다 타임아웃을 걸지 않음)
+                receive_task = asyncio.create_task(
+                    self.receive_chats(websocket, log_writer)
+                )
+                stop_task = asyncio.create_task(self._stop_event.wait())
+                done, pending = await asyncio.wait(
+                    {receive_task, stop_task}, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in pending:
+                    task.cancel()
+                if receive_task in done:
+                    receive_task.result()
 
-                    if message.get("cmd") == 0:
-                        await websocket.send('{"ver": "2", "cmd": 10000}')
+        except websockets.exceptions.ConnectionClosed as e:
+            if self._reconnecting:
+                return
+            self.error.emit(f"웹소켓 연결이 닫혔습니다: {e.reason} ({e.code})")
+        except Exception as e:
+            self.error.emit(f"웹소켓 오류 발생: {e}")
+        finally:
+            self._websocket = None
+
+    def flush_pending(self):
+        if self._pending:
+            self.new_message.emit("\n".join(self._pending))
+            self._pending.clear()
+
+    async def emit_pending(self):
+        """채팅을 50ms 단위로 모아 한 번의 시그널로 UI에 전달합니다."""
+        while True:
+            await asyncio.sleep(0.05)
+            self.flush_pending()
+
+    async def receive_chats(self, websocket, log_writer):
+        while True:
+            # 서버는 UTF-8 JSON만 보내므로 디코딩/검증 없이 bytes 그대로 파싱합니다.
+            message_str = await websocket.recv(decode=False)
+            message = json_loads(message_str)
+
+            cmd = message.get("cmd")
+            if cmd == 0:
+                await websocket.send(PONG_FRAME, text=True)
+                continue
+
+            # 채팅/후원 이외의 프레임(접속 응답, 최근 채팅 목록 등)은 건너뜁니다.
+            if cmd not in CHAT_COMMANDS:
+                continue
+
+            chat_data = message.get("bdy", [])
+            for chat in chat_data:
+                try:
+                    msg_time_ms = chat.get("msgTime")
+                    msg = chat.get("msg")
+                    if not (msg_time_ms and msg):
                         continue
 
-                    chat_data = message.get("bdy", [])
-                    for chat in chat_data:
+                    # 익명 후원은 profile이 null로 내려옵니다.
+                    profile = chat.get("profile")
+                    try:
+                        nickname = (
+                            get_nickname(json_loads(profile)) if profile else "익명"
+                        )
+                    except KeyError:
+                        nickname = "익명"
+                    extras_str = chat.get("extras")
+                    extras = json_loads(extras_str) if extras_str else {}
+                    pay_amount = None
+                    if cmd == DONATION_COMMAND:
                         try:
-                            msg_time_ms = chat.get("msgTime")
-                            msg = chat.get("msg")
-                            nickname = json.loads(chat.get("profile", "{}")).get(
-                                "nickname", "익명"
-                            )
-                            extras = json.loads(chat.get("extras", "{}"))
+                            pay_amount, os_type = get_donation(extras)
+                        except KeyError:
+                            # osType이 없는 후원도 금액은 그대로 기록합니다.
                             pay_amount = extras.get("payAmount")
                             os_type = extras.get("osType")
+                    else:
+                        os_type = extras.get("osType")
 
-                            if not (msg_time_ms and msg):
-                                continue
-
-                            dt_object = datetime.datetime.fromtimestamp(
-                                msg_time_ms / 1000
-                            )
-                            formatted_time = dt_object.strftime("%H:%M:%S")
-
-                            os_info = f" ({os_type})" if os_type else ""
-
-                            if pay_amount and pay_amount > 0:
-                                log_message = f"[{formatted_time}] {nickname}{os_info} ({pay_amount}원 후원): {msg}"
-                            else:
-                                log_message = (
-                                    f"[{formatted_time}] {nickname}{os_info}: {msg}"
-                                )
-
-                            self.new_message.emit(log_message)
-                            if file_stream:
-                                await file_stream.write(log_message + "\n")
-                                await file_stream.flush()
+                    log_message = format_chat(
+                        msg_time_ms, nickname, os_type, pay_amount, msg
+                    )
 
-                        except json.JSONDecodeError:
-                            self.error.emit(f"JSON 파싱 오류: {chat}")
-                        except Exception:
-                            continue
+                    self._pending.append(log_message)
+                    if log_writer:
+                        log_writer.write(log_message + "\n")
 
-        except websockets.exceptions.ConnectionClosed as e:
-            self.error.emit(f"웹소켓 연결이 닫혔습니다: {e.reason} ({e.code})")
-        except Exception as e:
-            self.error.emit(f"웹소켓 오류 발생: {e}")
+                except json.JSONDecodeError:
+                    self.error.emit(f"JSON 파싱 오류: {chat}")
+                except Exception:
+                    continue
 
 
 class MainWindow(FluentWindow):
@@ -222,6 +414,7 @@ class MainWindow(FluentWindow):
         self.status_layout = QVBoxLayout(self.status_card)
         self.status_output = TextEdit()
         self.status_output.setReadOnly(True)
+        self.status_output.document().setMaximumBlockCount(5000)
         self.status_layout.addWidget(BodyLabel(text="실시간 채팅 로그"))
         self.status_layout.addWidget(self.status_output)
         self.main_layout.addWidget(self.status_card, 1)
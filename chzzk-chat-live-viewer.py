@@ -1,19 +1,156 @@
 import asyncio
 import json
 import websockets
-import datetime
 import logging
 import random
+import re
+import sys
+import time
+from functools import lru_cache
+from operator import itemgetter
 import aiohttp
-import aiofiles
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    if sys.platform == "win32":
+        from winloop import new_event_loop
+    else:
+        from uvloop import new_event_loop
+except ImportError:
+    new_event_loop = asyncio.new_event_loop
 
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+# 서버 PING(cmd 0)에 대한 PONG 응답 프레임
+PONG_FRAME = b'{"ver":"2","cmd":10000}'
+
+# 채팅 서버 접속 메시지. 연결할 때 __CID__ 자리에 채널 ID만 채워 넣습니다.
+HANDSHAKE_TEMPLATE = json.dumps(
+    {
+        "ver": "3",
+        "cmd": 100,
+        "svcid": "game",
+        "cid": "__CID__",
+        "bdy": {
+            "uid": None,
+            "devType": 2001,
+            "accTkn": "",
+            "auth": "READ",
+            "libVer": "4.9.3",
+            "osVer": "Windows/10",
+            "devName": "Mozilla Firefox/140.0",
+            "locale": "ko-KR",
+            "timezone": "Asia/Seoul",
+        },
+        "tid": 1,
+    }
+)
+# 채널 ID별로 완성된 접속 메시지(bytes)
+HANDSHAKE_CACHE = {}
+
+# 채팅(93101), 후원(93102) 메시지 cmd
+CHAT_COMMANDS = frozenset((93101, 93102))
+DONATION_COMMAND = 93102
+
+# profile/extras JSON에서 필요한 값만 꺼내는 getter (후원 금액은 후원 메시지에만 있음)
+get_nickname = itemgetter("nickname")
+get_donation = itemgetter("payAmount", "osType")
+
+# 채팅 로그 한 줄 포맷 (후원 / 일반)
+DONATION_FORMAT = "[%s] %s%s (%s원 후원): %s\n"
+CHAT_FORMAT = "[%s] %s%s: %s\n"
+
+# --ndjson 모드에서 채팅 한 건을 기록하는 JSON 한 줄 포맷
+NDJSON_FORMAT = (
+    '{"msgTime":%d,"nickname":"%s","osType":"%s","payAmount":%d,"msg":"%s"}\n'
+)
+
+# JSON 문자열 안에서 이스케이프가 필요한 문자
+NEEDS_ESCAPE = re.compile(r'[\x00-\x1f"\\]')
+
+
+@lru_cache(maxsize=4096)
+def format_time(sec):
+    """초 단위 타임스탬프를 로그용 시간 문자열로 변환합니다. (같은 초의 채팅은 캐시 사용)"""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+
+
+def format_ndjson(msg_time_ms, nickname, os_type, pay_amount, msg):
+    """
+    채팅 한 건을 NDJSON 한 줄로 변환합니다.
+    이스케이프할 문자가 없고 숫자 값이 정수인 대부분의 채팅은 json.dumps를 거치지 않고
+    바로 만듭니다.
+    """
+    os_type = os_type or ""
+    pay_amount = pay_amount or 0
+    if (
+        type(msg_time_ms) is not int
+        or type(pay_amount) is not int
+        or NEEDS_ESCAPE.search(nickname)
+        or NEEDS_ESCAPE.search(msg)
+        or NEEDS_ESCAPE.search(os_type)
+    ):
+        record = {
+            "msgTime": msg_time_ms,
+            "nickname": nickname,
+            "osType": os_type,
+            "payAmount": pay_amount,
+            "msg": msg,
+        }
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+    return NDJSON_FORMAT % (msg_time_ms, nickname, os_type, pay_amount, msg)
+
+
+def format_chat(msg_time_ms, nickname, os_type, pay_amount, msg):
+    """채팅 한 건을 로그 한 줄로 변환합니다."""
+    formatted_time = format_time(msg_time_ms // 1000)
+    os_info = f" ({os_type})" if os_type else ""
+    if pay_amount and pay_amount > 0:
+        return DONATION_FORMAT % (formatted_time, nickname, os_info, pay_amount, msg)
+    return CHAT_FORMAT % (formatted_time, nickname, os_info, msg)
+
+
+def handshake_frame(chat_channel_id):
+    """채널별 접속 메시지를 bytes로 만들어 두고, 재연결할 때는 캐시를 사용합니다."""
+    payload = HANDSHAKE_CACHE.get(chat_channel_id)
+    if payload is None:
+        payload = HANDSHAKE_TEMPLATE.replace("__CID__", chat_channel_id, 1).encode()
+        HANDSHAKE_CACHE[chat_channel_id] = payload
+    return payload
 
-async def connect_to_websocket(channel_id, file_stream):
+
+class ChatLogWriter:
+    """
+    채팅 로그를 파일 버퍼에 쌓아 두었다가 주기적으로 디스크에 기록하는 클래스
+    """
+
+    def __init__(self, file_stream, interval=0.25):
+        # file_stream: open(..., "ab", buffering=...)로 연 버퍼드 바이너리 파일
+        self.file_stream = file_stream
+        self.interval = interval
+
+    def write(self, line):
+        # 메모리 버퍼에 복사만 하므로 이벤트 루프를 막지 않습니다.
+        self.file_stream.write(line.encode())
+
+    async def flush(self):
+        await asyncio.to_thread(self.file_stream.flush)
+
+    async def run(self):
+        """interval마다 버퍼에 쌓인 로그를 파일에 기록합니다."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+
+async def connect_to_websocket(channel_id, log_writer, ndjson=False):
     uri = f"wss://kr-ss{random.randint(1, 10)}.chat.naver.com/chat"
     print(f"웹소켓 URI: {uri}")
 
@@ -23,39 +160,35 @@ async def connect_to_websocket(channel_id, file_stream):
             uri,
             user_agent_header="Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:140.0) Gecko/20100101 Firefox/140.0",
             origin="https://chzzk.naver.com",
+            # 연결 유지는 서버 PING(cmd 0)에 직접 응답하므로 라이브러리 ping은 끕니다.
+            ping_interval=None,
+            ping_timeout=None,
+            # 작은 JSON 텍스트 프레임뿐이므로 프레임마다 zlib 압축 해제를 하지 않습니다.
+            compression=None,
+            max_queue=256,
+            max_size=2**20,
         ) as websocket:
             print(f"웹소켓 연결 성공: {uri}")
 
             # 서버에 보낼 메시지 (예시)
-            message_to_send = {
-                "ver": "3",
-                "cmd": 100,
-                "svcid": "game",
-                "cid": channel_id,
-                "bdy": {
-                    "uid": None,
-                    "devType": 2001,
-                    "accTkn": "",
-                    "auth": "READ",
-                    "libVer": "4.9.3",
-                    "osVer": "Windows/10",
-                    "devName": "Mozilla Firefox/140.0",
-                    "locale": "ko-KR",
-                    "timezone": "Asia/Seoul",
-                },
-                "tid": 1,
-            }
-            await websocket.send(json.dumps(message_to_send))
-            print(f"> 서버로 보낸 메시지: {message_to_send}")
+            message_to_send = handshake_frame(channel_id)
+            await websocket.send(message_to_send, text=True)
+            print(f"> 서버로 보낸 메시지: {message_to_send.decode()}")
 
             print(await websocket.recv())
 
             while True:
-                message_str = await websocket.recv()
-                message = json.loads(message_str)
+                # 서버는 UTF-8 JSON만 보내므로 디코딩/검증 없이 bytes 그대로 파싱합니다.
+                message_str = await websocket.recv(decode=False)
+                message = json_loads(message_str)
                 # 서버 PING 메시지에 대한 PONG 응답 (연결 유지)
-                if message.get("cmd") == 0:
-                    await websocket.send('{"ver": "2", "cmd": 10000}')
+                cmd = message.get("cmd")
+                if cmd == 0:
+                    await websocket.send(PONG_FRAME, text=True)
+                    continue
+
+                # 채팅/후원 이외의 프레임(접속 응답, 최근 채팅 목록 등)은 건너뜁니다.
+                if cmd not in CHAT_COMMANDS:
                     continue
 
                 chat_data = message.get("bdy", [])
@@ -63,34 +196,45 @@ async def connect_to_websocket(channel_id, file_stream):
                     try:
                         msg_time_ms = chat.get("msgTime")
                         msg = chat.get("msg")
+                        if not (msg_time_ms and msg):
+                            continue
 
-                        profile_json = json.loads(chat.get("profile", "{}"))
-                        nickname = profile_json.get("nickname", "익명")
+                        # profile/extras는 출력할 메시지가 있을 때만 파싱합니다.
+                        # 익명 후원은 profile이 null로 내려옵니다.
+                        profile = chat.get("profile")
+                        try:
+                            nickname = (
+                                get_nickname(json_loads(profile)) if profile else "익명"
+                            )
+                        except KeyError:
+                            nickname = "익명"
 
-                        extras_json = json.loads(chat.get("extras", "{}"))
-                        os_type = extras_json.get("osType")
-                        pay_amount = extras_json.get("payAmount")
+                        extras = chat.get("extras")
+                        extras_json = json_loads(extras) if extras else {}
+                        pay_amount = None
+                        if cmd == DONATION_COMMAND:
+                            try:
+                                pay_amount, os_type = get_donation(extras_json)
+                            except KeyError:
+                                # osType이 없는 후원도 금액은 그대로 기록합니다.
+                                pay_amount = extras_json.get("payAmount")
+                                os_type = extras_json.get("osType")
+                        else:
+                            os_type = extras_json.get("osType")
 
-                        if msg_time_ms and msg:
-                            # 타임스탬프를 사람이 읽을 수 있는 시간 포맷으로 변경
-                            dt_object = datetime.datetime.fromtimestamp(
-                                msg_time_ms / 1000
-                            )
-                            formatted_time = dt_object.strftime("%Y-%m-%d %H:%M:%S")
-                            os_info = f" ({os_type})" if os_type else ""
-
-                            if pay_amount and pay_amount > 0:
-                                log_message = f"[{formatted_time}] {nickname}{os_info} ({pay_amount}원 후원): {msg}\n"
-                            else:
-                                log_message = (
-                                    f"[{formatted_time}] {nickname}{os_info}: {msg}\n"
-                                )
+                        log_message = format_chat(
+                            msg_time_ms, nickname, os_type, pay_amount, msg
+                        )
 
-                            await file_stream.write(log_message)
-                            await (
-                                file_stream.flush()
-                            )  # 버퍼를 플러시하여 파일에 즉시 쓰도록 합니다.
-                            print(log_message.strip())
+                        if ndjson:
+                            log_writer.write(
+                                format_ndjson(
+                                    msg_time_ms, nickname, os_type, pay_amount, msg
+                                )
+                            )
+                        else:
+                            log_writer.write(log_message)
+                        print(log_message.strip())
                     except Exception:
                         continue
 
@@ -102,7 +246,9 @@ async def connect_to_websocket(channel_id, file_stream):
 
 async def main():
     channel_id = input("채널 ID를 입력하세요 (예: affa78....): ")
-    output_file = "chat.txt"
+    # --ndjson 옵션을 주면 한 줄에 JSON 하나씩 기록합니다.
+    ndjson = "--ndjson" in sys.argv[1:]
+    output_file = "chat.jsonl" if ndjson else "chat.txt"
 
     api_url = (
         f"https://api.chzzk.naver.com/polling/v2/channels/{channel_id}/live-status"
@@ -125,15 +271,22 @@ async def main():
         return
 
     # 프로그램이 중단되지 않는 한, 연결이 끊어지면 5초 후 자동으로 재연결을 시도합니다.
-    async with aiofiles.open(output_file, "a", encoding="utf-8") as f:
-        while True:
-            await connect_to_websocket(chat_channel_id, f)
-            logging.info("5초 후 재연결을 시도합니다...")
-            await asyncio.sleep(5)
+    # 파일 열기는 디스크 I/O이므로 이벤트 루프를 막지 않게 스레드에서 엽니다.
+    with await asyncio.to_thread(open, output_file, "ab", buffering=1 << 20) as f:
+        log_writer = ChatLogWriter(f)
+        flush_task = asyncio.create_task(log_writer.run())
+        try:
+            while True:
+                await connect_to_websocket(chat_channel_id, log_writer, ndjson)
+                logging.info("5초 후 재연결을 시도합니다...")
+                await asyncio.sleep(5)
+        finally:
+            flush_task.cancel()
+            await log_writer.flush()
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        asyncio.run(main(), loop_factory=new_event_loop)
     except KeyboardInterrupt:
         print("\n프로그램을 종료합니다.")
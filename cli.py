@@ -1,5 +1,8 @@
+import re
+import shutil
 import sys
 import tempfile
+import unicodedata
 import yt_dlp
 import typer
 import streamlink
@@ -10,6 +13,39 @@ from typing_extensions import Annotated
 temp = os.path.join(tempfile.gettempdir(), "Anya")
 app = typer.Typer()
 
+# aria2c 추가 옵션 (사전 할당으로 조각 파일이 흩어지지 않게 하고,
+# 끊긴 연결은 5초 간격으로 5번까지 재시도)
+ARIA2C_ARGS = [
+    "--file-allocation=falloc",
+    "--max-tries=5",
+    "--retry-wait=5",
+]
+
+# YouTube 서명(nsig) 해독에 쓸 수 있는 JavaScript 런타임 (yt-dlp 이름, 실행 파일 이름)
+# 앞에 있을수록 우선합니다.
+JS_RUNTIMES = (("deno", "deno"), ("node", "node"), ("bun", "bun"), ("quickjs", "qjs"))
+
+# yt-dlp 내장 HTTP 다운로더가 한 번에 요청하는 Range 크기 (10 MiB)
+# 큰 Range 요청 하나는 YouTube에서 속도 제한을 받으므로 잘게 나눠 요청합니다.
+HTTP_CHUNK_SIZE = 10 << 20
+
+# 라이브 스트림을 파일로 복사할 때 사용하는 버퍼 크기 (1 MiB)
+STREAM_CHUNK = 1 << 20
+
+# 파일명에 쓸 수 없는 문자 (영숫자, 공백, -, _ 이외의 문자)
+SANITIZE_RE = re.compile(r"[^\w \-]")
+
+
+def find_js_runtimes():
+    """
+    PATH에 설치된 JavaScript 런타임을 yt-dlp의 js_runtimes 옵션 형식으로 반환합니다.
+    yt-dlp(2025.11.12 이상)는 기본으로 deno만 사용하므로, node 등 다른 런타임만 있는
+    환경에서도 쓰게 합니다. (해독 스크립트는 yt-dlp[default]의 yt-dlp-ejs 패키지에 포함)
+    """
+    return {
+        name: {"path": path} for name, exe in JS_RUNTIMES if (path := shutil.which(exe))
+    }
+
 
 def download_video(video_url: str, cookies_file: str | None = None):
     """
@@ -26,14 +62,22 @@ def download_video(video_url: str, cookies_file: str | None = None):
     ydl_opts = {
         "format": "bestvideo+bestaudio/best",
         "merge_output_format": "mkv",
-        "downloader": "aria2c",
-        "downloader_args": {"aria2c": ["--dir=" + temp_dir]},
+        # aria2c로 임시 디렉토리에 받은 뒤 병합된 파일만 현재 디렉토리로 옮깁니다.
+        "external_downloader": {"default": "aria2c"},
+        # yt-dlp가 이미 -x16 -s16 --min-split-size 1M을 넘기므로 그 외 옵션만 추가합니다.
+        "external_downloader_args": {"aria2c": ARIA2C_ARGS},
+        "paths": {"temp": temp_dir},
         "live_from_start": True,
+        "http_chunk_size": HTTP_CHUNK_SIZE,
         "no_warnings": True,
     }
 
     if cookies_file:
         ydl_opts["cookiefile"] = cookies_file
+    # 찾은 런타임이 없으면 yt-dlp 기본값(deno)을 그대로 둡니다.
+    js_runtimes = find_js_runtimes()
+    if js_runtimes:
+        ydl_opts["js_runtimes"] = js_runtimes
 
     try:
         print("yt-dlp로 다운로드를 시작합니다... (중단하려면 Ctrl+C를 누르세요)")
@@ -55,7 +99,7 @@ def download_video(video_url: str, cookies_file: str | None = None):
 def download_live_stream(video_url: str, cookies_file: str | None = None):
     """
     주어진 URL의 라이브 스트림을 streamlink를 사용하여 다운로드합니다.
-    yt-dlp를 사용하여 제목을 먼저 추출합니다.
+    파일명에 쓸 제목은 streamlink 플러그인이 스트림을 찾으면서 가져온 값을 사용합니다.
     사용자가 Ctrl+C를 누르면 다운로드를 중단하고 정리합니다.
 
     :param video_url: 다운로드할 라이브 스트림의 URL
@@ -63,47 +107,39 @@ def download_live_stream(video_url: str, cookies_file: str | None = None):
     """
 
     try:
-        # 1. yt-dlp를 사용하여 비디오 제목 추출
-        title = "livestream"
-        try:
-            ydl_opts = {"quiet": True, "skip_download": True, "no_warnings": True}
-            if cookies_file:
-                ydl_opts["cookiefile"] = cookies_file
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(video_url, download=False)
-                title = info.get("title", "livestream")
-        except Exception as e:
-            print(
-                f"경고: yt-dlp로 제목을 가져오는 데 실패했습니다. 기본 파일명을 사용합니다. 오류: {e}",
-                file=sys.stderr,
-            )
-
-        # 2. streamlink로 다운로드 준비
+        # 1. streamlink로 스트림을 찾고, 플러그인이 가져온 제목으로 파일명을 정합니다.
         session = streamlink.Streamlink()
         if cookies_file:
             session.set_option("http-cookie-file", cookies_file)
-        streams = session.streams(video_url)
+        _, plugin_class, resolved_url = session.resolve_url(video_url)
+        plugin = plugin_class(session, resolved_url)
+        streams = plugin.streams()
 
         if not streams:
             print("스트림을 찾을 수 없습니다.", file=sys.stderr)
             sys.exit(1)
+        title = plugin.get_title() or "livestream"
 
         best_stream = streams["best"]
         print(
             "최고 화질 스트림을 다운로드합니다... (중단하려면 Ctrl+C를 5초간 누르세요)"
         )
 
+        # 호환 문자(전각 영숫자 등)는 NFKC로 일반 문자로 바꾼 뒤 걸러내고, 길이는 200자로 제한합니다.
         safe_filename = (
-            "".join(c for c in title if c.isalnum() or c in (" ", "-", "_")).rstrip()
+            SANITIZE_RE.sub("", unicodedata.normalize("NFKC", title))[:200].rstrip()
             + ".ts"
         )
 
         print(f"파일 저장 경로: {safe_filename}")
 
-        # 3. 다운로드 시작
-        with best_stream.open() as fd, open(safe_filename, "wb") as f:
-            for chunk in iter(lambda: fd.read(8192), b""):
-                f.write(chunk)
+        # 2. 다운로드 시작
+        # 중단(Ctrl+C)되더라도 with 블록이 닫히면서 받은 부분까지는 파일에 기록됩니다.
+        with (
+            best_stream.open() as fd,
+            open(safe_filename, "wb", buffering=STREAM_CHUNK) as f,
+        ):
+            shutil.copyfileobj(fd, f, STREAM_CHUNK)
 
         print(f"\n라이브 스트림 다운로드 성공: {safe_filename}")
 
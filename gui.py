@@ -1,15 +1,29 @@
+import multiprocessing
+import os
+import re
+import shutil
+import signal
 import sys
 import tempfile
+import unicodedata
 import asyncio
 import json
-import datetime
 import random
+import time
+from collections import deque
+from functools import lru_cache
 import aiohttp
 
-import streamlink
-import yt_dlp
 import websockets
-from PySide6.QtCore import QThread, QObject, Signal, Slot, Qt
+from PySide6.QtCore import (
+    QObject,
+    QRunnable,
+    QThreadPool,
+    QTimer,
+    Signal,
+    Slot,
+    Qt,
+)
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (
     QApplication,
@@ -17,6 +31,7 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
     QHBoxLayout,
     QFileDialog,
+    QTextEdit,
 )
 from qfluentwidgets import (
     FluentWindow,
@@ -24,134 +39,566 @@ from qfluentwidgets import (
     PrimaryPushButton,
     CheckBox,
     TextEdit,
+    PlainTextEdit,
     CardWidget,
     setTheme,
     Theme,
     BodyLabel,
     CaptionLabel,
     SwitchButton,
+    SpinBox,
     FluentIcon,
 )
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# aria2c 추가 옵션 (사전 할당으로 조각 파일이 흩어지지 않게 하고,
+# 끊긴 연결은 5초 간격으로 5번까지 재시도)
+ARIA2C_ARGS = [
+    "--file-allocation=falloc",
+    "--max-tries=5",
+    "--retry-wait=5",
+]
+
+# 파일 크기별 aria2c 분할 설정 (이 크기 미만일 때, 최대 분할 수, 최소 분할 크기)
+# 작은 파일은 연결을 적게 열고, 큰 파일은 조각을 크게 잘라 연결 수립 비용을 줄입니다.
+ARIA2C_SPLIT_TIERS = (
+    (100 << 20, 4, "1M"),
+    (2 << 30, 16, "4M"),
+    (float("inf"), 16, "16M"),
+)
+
+# YouTube 서명(nsig) 해독에 쓸 수 있는 JavaScript 런타임 (yt-dlp 이름, 실행 파일 이름)
+# 앞에 있을수록 우선합니다.
+JS_RUNTIMES = (("deno", "deno"), ("node", "node"), ("bun", "bun"), ("quickjs", "qjs"))
+
+# yt-dlp 내장 HTTP 다운로더가 한 번에 요청하는 Range 크기 (10 MiB)
+# 큰 Range 요청 하나는 YouTube에서 속도 제한을 받으므로 잘게 나눠 요청합니다.
+HTTP_CHUNK_SIZE = 10 << 20
+# 추출한 비디오 정보를 다시 받기에 재사용하는 시간 (초). 스트림 URL이 만료되기 전까지만 씁니다.
+INFO_CACHE_TTL = 60 * 60
+
+# 라이브 스트림을 파일로 복사할 때 사용하는 버퍼 크기 (1 MiB)
+STREAM_CHUNK = 1 << 20
+# 이만큼 기록할 때마다 이미 쓴 구간을 페이지 캐시에서 내립니다. (리눅스, 64 MiB)
+CACHE_DROP_INTERVAL = 64 << 20
+# 녹화 파일을 조각나지 않게 미리 할당하는 단위 (리눅스, 1 GiB)
+PREALLOC_SIZE = 1 << 30
+# 병합할 파일을 받을 메모리 파일시스템 (리눅스 tmpfs)
+SHM_DIR = "/dev/shm"
 
-class Stream(QObject):
+# 파일명에 쓸 수 없는 문자 (영숫자, 공백, -, _ 이외의 문자)
+SANITIZE_RE = re.compile(r"[^\w \-]")
+
+# 다운로드 프로세스는 spawn으로 띄웁니다. Qt GUI 스레드나 채팅 스레드가 도는 중에
+# 스레드 풀에서 fork하면, 자식이 import 잠금 등을 잡은 채로 복사되어 멈출 수 있습니다.
+MP_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def copy_stream(src, dst):
+    """
+    라이브 스트림을 파일로 복사합니다.
+    posix_fadvise를 쓸 수 있으면 디스크에 기록된 구간을 페이지 캐시에서 내려
+    몇 시간짜리 녹화에서도 캐시가 쌓이지 않게 하고, 파일 공간을 1 GiB씩 미리
+    할당해 조각나지 않게 합니다.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        shutil.copyfileobj(src, dst, STREAM_CHUNK)
+        return
+
+    out_fd = dst.fileno()
+    written = dropped = 0
+    reserved = reserve_space(out_fd, 0)
+    try:
+        while chunk := src.read(STREAM_CHUNK):
+            dst.write(chunk)
+            written += len(chunk)
+            if reserved and written + STREAM_CHUNK > reserved:
+                reserved = reserve_space(out_fd, reserved)
+            if written - dropped >= CACHE_DROP_INTERVAL:
+                # 더티 페이지는 DONTNEED로 내려가지 않으므로 먼저 디스크에 씁니다.
+                dst.flush()
+                os.fdatasync(out_fd)
+                os.posix_fadvise(
+                    out_fd, dropped, written - dropped, os.POSIX_FADV_DONTNEED
+                )
+                dropped = written
+    finally:
+        # 미리 할당해 두고 쓰지 않은 뒷부분을 잘라냅니다.
+        dst.flush()
+        os.ftruncate(out_fd, written)
+
+
+def reserve_space(fd, offset):
     """
-    stdout, stderr의 출력을 캡처하여 signal로 보내는 클래스
+    offset부터 PREALLOC_SIZE만큼 디스크 공간을 미리 할당하고, 할당된 끝 위치를 반환합니다.
+    파일 시스템이 지원하지 않으면 0을 반환합니다.
+    """
+    try:
+        os.posix_fallocate(fd, offset, PREALLOC_SIZE)
+    except OSError:
+        return 0
+    return offset + PREALLOC_SIZE
+
+
+@lru_cache(maxsize=4096)
+def format_time(sec):
+    """초 단위 타임스탬프를 채팅 시간 문자열로 변환합니다. (같은 초의 채팅은 캐시 사용)"""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+
+
+# 서버 PING(cmd 0)에 대한 PONG 응답 프레임
+PONG_FRAME = b'{"ver":"2","cmd":10000}'
+
+# 채팅(93101), 후원(93102) 메시지 cmd
+CHAT_COMMANDS = frozenset((93101, 93102))
+
+# 채널 ID별로 완성된 채팅 서버 접속 메시지(bytes)
+HANDSHAKE_CACHE = {}
+
+
+def handshake_frame(chat_channel_id):
+    """채널별 접속 메시지를 bytes로 만들어 두고, 재연결할 때는 캐시를 사용합니다."""
+    payload = HANDSHAKE_CACHE.get(chat_channel_id)
+    if payload is None:
+        connect_message = {
+            "ver": "3",
+            "cmd": 100,
+            "svcid": "game",
+            "cid": chat_channel_id,
+            "bdy": {
+                "uid": None,
+                "devType": 2001,
+                "accTkn": "",
+                "auth": "READ",
+                "libVer": "4.9.3",
+                "osVer": "Windows/10",
+                "devName": "Mozilla Firefox/140.0",
+                "locale": "ko-KR",
+                "timezone": "Asia/Seoul",
+            },
+            "tid": 1,
+        }
+        payload = json.dumps(connect_message).encode()
+        HANDSHAKE_CACHE[chat_channel_id] = payload
+    return payload
+
+
+class PipeLogger:
+    """
+    다운로드 프로세스에서 yt-dlp 로그를 파이프로 부모 프로세스에 전달하는 로거
     """
 
-    new_text = Signal(str)
+    def __init__(self, report):
+        self.report = report
 
-    def write(self, text):
-        self.new_text.emit(str(text))
+    def debug(self, msg):
+        # yt-dlp는 일반 화면 출력도 debug로 보내므로, 실제 디버그 메시지만 건너뜁니다.
+        if not msg.startswith("[debug] "):
+            self.report(msg)
 
-    def flush(self):
-        pass
+    def info(self, msg):
+        self.report(msg)
 
+    def warning(self, msg):
+        self.report(msg)
 
-class Worker(QObject):
+    def error(self, msg):
+        self.report(msg)
+
+
+def make_progress_hook(report, interval=0.25):
     """
-    별도의 스레드에서 다운로드 작업을 처리하는 클래스
+    yt-dlp 진행 상황을 interval(초)마다 한 번만 보고하는 progress hook을 만듭니다.
     """
+    last_report = 0.0
+
+    def hook(d):
+        nonlocal last_report
+        status = d.get("status")
+        if status == "downloading":
+            now = time.monotonic()
+            if now - last_report < interval:
+                return
+            last_report = now
 
-    finished = Signal()
-    error = Signal(str)
-    progress = Signal(str)
+            downloaded = d.get("downloaded_bytes") or 0
+            total = d.get("total_bytes") or d.get("total_bytes_estimate")
+            speed = d.get("speed")
+            if total:
+                done = f"{downloaded / total * 100:5.1f}%"
+            else:
+                done = f"{downloaded / 2**20:.1f}MiB"
+            rate = f"{speed / 2**20:.2f}MiB/s" if speed else "--"
+            report(f"{done} {rate}")
+        elif status == "finished":
+            report(f"파일 다운로드 완료: {d.get('filename')}")
 
-    def __init__(self, video_url, live, cookies_file):
-        super().__init__()
-        self.video_url = video_url
-        self.live = live
-        self.cookies_file = cookies_file
+    return hook
 
-    @Slot()
-    def run(self):
-        """
-        다운로드 작업을 시작합니다.
-        """
+
+def aria2c_args(connections, filesize=None):
+    """
+    aria2c 추가 옵션을 만듭니다. 파일 크기를 알면 분할 수(-s)와 최소 분할 크기(-k)를 맞춥니다.
+    (yt-dlp가 기본으로 넘기는 -x16 -s16 --min-split-size 1M 뒤에 붙으므로 이 값이 우선합니다)
+    """
+    if not filesize:
+        return ARIA2C_ARGS + [f"-x{connections}", f"-s{connections}"]
+    for limit, split, min_split in ARIA2C_SPLIT_TIERS:
+        if filesize < limit:
+            break
+    return ARIA2C_ARGS + [
+        f"-x{connections}",
+        f"-s{min(split, connections)}",
+        f"-k{min_split}",
+    ]
+
+
+def find_js_runtimes():
+    """
+    PATH에 설치된 JavaScript 런타임을 yt-dlp의 js_runtimes 옵션 형식으로 반환합니다.
+    yt-dlp(2025.11.12 이상)는 기본으로 deno만 사용하므로, node 등 다른 런타임만 있는
+    환경에서도 쓰게 합니다. (해독 스크립트는 yt-dlp[default]의 yt-dlp-ejs 패키지에 포함)
+    """
+    return {
+        name: {"path": path} for name, exe in JS_RUNTIMES if (path := shutil.which(exe))
+    }
+
+
+def pick_temp_dir(output_dir, filesize, lanes=1):
+    """
+    병합 전 파일을 받을 임시 폴더를 고릅니다.
+    /dev/shm에 파일 크기의 두 배(조각 파일 + 병합 결과) 이상 여유가 있으면 그 아래에
+    이번 다운로드 전용 폴더를 만들어 메모리에서 받고 병합해, 디스크에는 완성된 파일을
+    옮길 때 한 번만 씁니다. 동시에 받는 다른 프로세스(lanes)도 같은 공간을 쓸 수 있으므로
+    여유 공간은 그만큼 넉넉하게 봅니다.
+    """
+    if (
+        filesize
+        and os.path.isdir(SHM_DIR)
+        and shutil.disk_usage(SHM_DIR).free > 2 * filesize * lanes
+    ):
+        return tempfile.mkdtemp(prefix="yt-dlp-script-", dir=SHM_DIR)
+    return output_dir
+
+
+def create_ydl(cookies_file, report, fragments=5, connections=16, output_dir="."):
+    """
+    다운로드에 사용할 YoutubeDL 인스턴스를 만듭니다.
+    한 프로세스에서 받는 URL들은 이 인스턴스 하나를 같이 사용합니다.
+    """
+    # yt-dlp는 추출기 모듈이 많아 import가 느리므로, 창을 띄울 때가 아니라
+    # 다운로드 프로세스 안에서 필요할 때 불러옵니다.
+    import yt_dlp
+
+    ydl_opts = {
+        "format": "bestvideo+bestaudio/best",
+        "merge_output_format": "mkv",
+        "external_downloader": {"default": "aria2c"},
+        # 파일 크기를 알게 되면 download_video에서 분할 설정을 다시 정합니다.
+        "external_downloader_args": {"aria2c": aria2c_args(connections)},
+        # 임시 파일도 저장 폴더에 받아, 병합된 파일을 다른 파일시스템으로
+        # 다시 복사하지 않고 이름만 바꿔 옮기게 합니다.
+        "paths": {"home": output_dir, "temp": output_dir},
+        "live_from_start": True,
+        "http_chunk_size": HTTP_CHUNK_SIZE,
+        # HLS/DASH 조각을 fragments개씩 동시에 받습니다. (yt-dlp -N 옵션)
+        "concurrent_fragment_downloads": fragments,
+        "no_warnings": True,
+        "logger": PipeLogger(report),
+        # 진행률은 화면 출력 대신 progress hook으로만 받습니다.
+        "noprogress": True,
+        # 화면 출력은 logger로만 받으므로 터미널용 출력과 ANSI 색상 코드는 만들지 않습니다.
+        "quiet": True,
+        "color": "no_color",
+        "progress_hooks": [make_progress_hook(report)],
+    }
+    if cookies_file:
+        ydl_opts["cookiefile"] = cookies_file
+    # 찾은 런타임이 없으면 yt-dlp 기본값(deno)을 그대로 둡니다.
+    js_runtimes = find_js_runtimes()
+    if js_runtimes:
+        ydl_opts["js_runtimes"] = js_runtimes
+    return yt_dlp.YoutubeDL(ydl_opts)
+
+
+def is_cacheable_info(info):
+    """
+    다시 받을 때 재사용해도 되는 비디오 정보인지 확인합니다.
+    진행 중인 라이브는 조각 목록을 함수로 만들어 두므로(sanitize_info로 옮기면 깨짐) 제외합니다.
+    """
+    for entry in (info, *(info.get("entries") or ())):
+        if not entry:
+            continue
+        if entry.get("is_live"):
+            return False
+        formats = [
+            entry,
+            *(entry.get("formats") or ()),
+            *(entry.get("requested_formats") or ()),
+        ]
+        if any(
+            "http_dash_segments_generator" in (f.get("protocol") or "") for f in formats
+        ):
+            return False
+    return True
+
+
+def download_video(
+    ydl,
+    video_url,
+    report,
+    connections=16,
+    output_dir=".",
+    info=None,
+    on_info=None,
+    lanes=1,
+):
+    """
+    yt-dlp를 사용하여 비디오를 다운로드합니다.
+    info가 있으면 추출기(네트워크 요청, nsig 해독)를 다시 돌리지 않고 그 정보로 받고,
+    새로 추출한 정보는 받기 전에 on_info로 넘겨 재시도할 때 쓸 수 있게 합니다.
+    """
+    from yt_dlp.utils import DownloadError
+
+    def process(info):
+        # 선택된 포맷의 크기에 맞춰 aria2c 분할 설정을 바꾼 뒤 받습니다.
+        formats = info.get("requested_formats") or [info]
+        filesize = sum(
+            f.get("filesize") or f.get("filesize_approx") or 0 for f in formats
+        )
+        ydl.params["external_downloader_args"]["aria2c"] = aria2c_args(
+            connections, filesize
+        )
+        # 병합이 필요한 경우에만 메모리 임시 폴더를 고려합니다.
+        temp_dir = (
+            pick_temp_dir(output_dir, filesize, lanes)
+            if len(formats) > 1
+            else output_dir
+        )
+        ydl.params["paths"]["temp"] = temp_dir
         try:
-            if self.live:
-                self.progress.emit("라이브 모드: streamlink를 사용하여 다운로드합니다.")
-                self.download_live_stream()
-            else:
-                self.progress.emit("일반 모드: yt-dlp를 사용하여 다운로드합니다.")
-                self.download_video()
-            self.progress.emit("✅ 다운로드 완료")
-        except Exception as e:
-            self.error.emit(f"❌ 오류 발생: {e}")
+            ydl.process_ie_result(info, download=True)
         finally:
-            self.finished.emit()
+            # 실패하면 yt-dlp가 .part 파일을 남기므로, 메모리를 계속 차지하지 않게 지웁니다.
+            # (성공했다면 완성된 파일은 이미 저장 폴더로 옮겨졌습니다)
+            if temp_dir != output_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+    try:
+        if info is not None:
+            report("이전에 가져온 정보로 다운로드를 시작합니다...")
+            try:
+                process(info)
+                return
+            except DownloadError:
+                # 스트림 URL이 만료되었을 수 있으므로 정보를 새로 가져와 한 번 더 시도합니다.
+                report("정보를 다시 가져와 다운로드합니다...")
+        else:
+            report("yt-dlp로 다운로드를 시작합니다...")
+        # 파일 크기를 알아야 분할 설정을 정할 수 있으므로 정보만 먼저 가져옵니다.
+        info = ydl.extract_info(video_url, download=False)
+        # 다운로드가 실패해도 재시도에 쓸 수 있도록 받기 전에 넘깁니다.
+        # sanitize_info는 JSON이 아닌 값을 문자열로 바꾸므로, 받을 때는 원본을 씁니다.
+        if on_info is not None and is_cacheable_info(info):
+            on_info(ydl.sanitize_info(info))
+        process(info)
+    except Exception as e:
+        raise RuntimeError(f"yt-dlp 다운로드 오류: {e}")
+
+
+def download_live_stream(video_url, cookies_file, report, output_dir="."):
+    """
+    streamlink를 사용하여 라이브 스트림을 다운로드합니다.
+    """
+    import streamlink
+
+    session = streamlink.Streamlink()
+    if cookies_file:
+        session.set_option("http-cookie-file", cookies_file)
+
+    # 파일명은 streamlink 플러그인이 스트림을 찾으면서 가져온 제목을 사용합니다.
+    # (제목만을 위해 yt-dlp 추출기를 한 번 더 돌리지 않음)
+    _, plugin_class, resolved_url = session.resolve_url(video_url)
+    plugin = plugin_class(session, resolved_url)
+    streams = plugin.streams()
+    if not streams:
+        raise RuntimeError("스트림을 찾을 수 없습니다.")
+    title = plugin.get_title() or "livestream"
+
+    best_stream = streams["best"]
+    report("최고 화질 스트림을 다운로드합니다...")
+
+    # 호환 문자(전각 영숫자 등)는 NFKC로 일반 문자로 바꾼 뒤 걸러내고, 길이는 200자로 제한합니다.
+    safe_filename = os.path.join(
+        output_dir,
+        SANITIZE_RE.sub("", unicodedata.normalize("NFKC", title))[:200].rstrip()
+        + ".ts",
+    )
+    report(f"파일 저장 경로: {safe_filename}")
+
+    try:
+        with (
+            best_stream.open() as fd,
+            open(safe_filename, "wb", buffering=STREAM_CHUNK) as f,
+        ):
+            copy_stream(fd, f)
+    except Exception as e:
+        raise RuntimeError(f"스트림 데이터 쓰기 중 오류 발생: {e}")
+
+
+def download_process_main(
+    job_queue, live, cookies_file, fragments, connections, output_dir, lanes, conn
+):
+    """
+    다운로드 프로세스의 진입점. job_queue에서 (메시지 머리말, URL, 저장된 비디오 정보)를
+    하나씩 꺼내 받고, None을 꺼내면 끝냅니다. 진행 상황은 ("progress" | "error", 메시지)로, 다시 쓸 비디오 정보는
+    ("info", (URL, 정보))로 파이프에 보냅니다.
+    """
+    label = ""
 
-    def download_video(self):
-        """
-        yt-dlp를 사용하여 비디오를 다운로드합니다.
-        """
-        temp_dir = tempfile.gettempdir()
-        ydl_opts = {
-            "format": "bestvideo+bestaudio/best",
-            "merge_output_format": "mkv",
-            "downloader": "aria2c",
-            "downloader_args": {"aria2c": ["--dir=" + temp_dir]},
-            "live_from_start": True,
-            "no_warnings": True,
-        }
-        if self.cookies_file:
-            ydl_opts["cookiefile"] = self.cookies_file
+    def report(text):
+        conn.send(("progress", label + text))
 
-        try:
-            self.progress.emit("yt-dlp로 다운로드를 시작합니다...")
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([self.video_url])
-        except Exception as e:
-            raise RuntimeError(f"yt-dlp 다운로드 오류: {e}")
+    def send_info(info):
+        conn.send(("info", (video_url, info)))
 
-    def download_live_stream(self):
-        """
-        streamlink를 사용하여 라이브 스트림을 다운로드합니다.
-        """
-        title = "livestream"
-        try:
-            ydl_opts = {"quiet": True, "skip_download": True, "no_warnings": True}
-            if self.cookies_file:
-                ydl_opts["cookiefile"] = self.cookies_file
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(self.video_url, download=False)
-                title = info.get("title", "livestream")
-        except Exception as e:
-            self.progress.emit(
-                f"경고: yt-dlp로 제목 가져오기 실패. 기본 파일명 사용. 오류: {e}"
-            )
+    def exit_on_sigterm(signum, frame):
+        sys.exit(128 + signum)
+
+    # GUI가 종료되면 multiprocessing이 데몬 자식 프로세스에 SIGTERM을 보냅니다.
+    # 예외로 바꿔 finally 블록(미리 할당한 녹화 파일 꼬리 잘라내기 등)이 실행되게 합니다.
+    signal.signal(signal.SIGTERM, exit_on_sigterm)
+
+    ydl = None
+    try:
+        if live:
+            report("라이브 모드: streamlink를 사용하여 다운로드합니다.")
+        else:
+            report("일반 모드: yt-dlp를 사용하여 다운로드합니다.")
+            # URL마다 새로 만들지 않고, 쿠키와 추출기를 한 번만 불러 계속 사용합니다.
+            ydl = create_ydl(cookies_file, report, fragments, connections, output_dir)
+
+        # 여러 프로세스가 같은 큐에서 꺼내므로, 먼저 끝난 프로세스가 다음 URL을 받습니다.
+        for label, video_url, info in iter(job_queue.get, None):
+            try:
+                if live:
+                    download_live_stream(video_url, cookies_file, report, output_dir)
+                else:
+                    download_video(
+                        ydl,
+                        video_url,
+                        report,
+                        connections,
+                        output_dir,
+                        info,
+                        send_info,
+                        lanes,
+                    )
+                report("✅ 다운로드 완료")
+            except Exception as e:
+                conn.send(("error", f"{label}❌ 오류 발생: {e}"))
+    except Exception as e:
+        conn.send(("error", f"{label}❌ 오류 발생: {e}"))
+    finally:
+        if ydl is not None:
+            ydl.close()
+        conn.close()
+
+
+class WorkerSignals(QObject):
+    """
+    Worker(QRunnable)가 UI로 보내는 signal 모음
+    """
 
-        session = streamlink.Streamlink()
-        if self.cookies_file:
-            session.set_option("http-cookie-file", self.cookies_file)
+    finished = Signal()
+    error = Signal(str)
+    progress = Signal(str)
+    info = Signal(str, object)
 
-        streams = session.streams(self.video_url)
-        if not streams:
-            raise RuntimeError("스트림을 찾을 수 없습니다.")
 
-        best_stream = streams["best"]
-        self.progress.emit("최고 화질 스트림을 다운로드합니다...")
+class Worker(QRunnable):
+    """
+    다운로드를 별도의 프로세스에서 실행하고, 진행 상황을 signal로 전달하는 클래스
+    (yt-dlp 후처리가 GIL을 잡고 있어도 UI가 멈추지 않도록 프로세스를 분리합니다)
+    """
 
-        safe_filename = (
-            "".join(c for c in title if c.isalnum() or c in (" ", "-", "_")).rstrip()
-            + ".ts"
-        )
-        self.progress.emit(f"파일 저장 경로: {safe_filename}")
+    def __init__(
+        self,
+        job_queue,
+        live,
+        cookies_file,
+        fragments=5,
+        connections=16,
+        output_dir=".",
+        lanes=1,
+    ):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = WorkerSignals()
+        self.job_queue = job_queue
+        self.live = live
+        self.cookies_file = cookies_file
+        self.concurrent_fragments = fragments
+        self.connections = connections
+        self.output_dir = output_dir
+        self.lanes = lanes
 
+    def run(self):
+        """
+        다운로드 프로세스를 시작하고, 끝날 때까지 메시지를 중계합니다.
+        """
+        recv_conn, send_conn = MP_CONTEXT.Pipe(duplex=False)
+        process = MP_CONTEXT.Process(
+            target=download_process_main,
+            args=(
+                self.job_queue,
+                self.live,
+                self.cookies_file,
+                self.concurrent_fragments,
+                self.connections,
+                self.output_dir,
+                self.lanes,
+                send_conn,
+            ),
+            daemon=True,
+        )
         try:
-            with best_stream.open() as fd, open(safe_filename, "wb") as f:
-                while True:
-                    chunk = fd.read(8192)
-                    if not chunk:
-                        break
-                    f.write(chunk)
+            process.start()
+            # 부모 쪽 송신단을 닫아야 자식이 끝났을 때 recv()가 EOFError를 냅니다.
+            send_conn.close()
+            failed = False
+            while True:
+                try:
+                    kind, text = recv_conn.recv()
+                except EOFError:
+                    break
+                if kind == "error":
+                    failed = True
+                    self.signals.error.emit(text)
+                elif kind == "info":
+                    self.signals.info.emit(*text)
+                else:
+                    self.signals.progress.emit(text)
+
+            process.join()
+            if process.exitcode and not failed:
+                self.signals.error.emit(
+                    f"❌ 다운로드 프로세스가 비정상 종료되었습니다. (exit code {process.exitcode})"
+                )
         except Exception as e:
-            raise RuntimeError(f"스트림 데이터 쓰기 중 오류 발생: {e}")
+            self.signals.error.emit(f"❌ 오류 발생: {e}")
+        finally:
+            recv_conn.close()
+            self.signals.finished.emit()
 
 
-class ChatWorker(QObject):
+class ChatWorkerSignals(QObject):
     """
-    별도의 스레드에서 치지직 채팅 수신을 처리하는 클래스
+    ChatWorker(QRunnable)가 UI로 보내는 signal 모음
     """
 
     finished = Signal()
@@ -159,55 +606,94 @@ class ChatWorker(QObject):
     chat_message = Signal(str)
     status_message = Signal(str)
 
+
+class ChatWorker(QRunnable):
+    """
+    별도의 스레드에서 치지직 채팅 수신을 처리하는 클래스
+    """
+
     def __init__(self, channel_id, save_to_file=False, file_path="chat.txt"):
         super().__init__()
+        self.setAutoDelete(False)
+        self.signals = ChatWorkerSignals()
         self.channel_id = channel_id
         self.save_to_file = save_to_file
         self.file_path = file_path
         self.running = True
         self.file_handle = None
+        self._http = None
+        self._task = None
+        self._loop = None
 
-    @Slot()
     def run(self):
         """
         채팅 수신을 시작합니다.
         """
         try:
             asyncio.run(self._async_run())
+        except asyncio.CancelledError:
+            pass  # stop()으로 중지됨
         except Exception as e:
-            self.error.emit(f"❌ 오류 발생: {e}")
+            self.signals.error.emit(f"❌ 오류 발생: {e}")
         finally:
-            self.finished.emit()
+            self.signals.finished.emit()
 
     async def _async_run(self):
         """
         비동기로 채팅을 수신합니다.
         """
-        try:
-            # chatChannelId 가져오기
-            chat_channel_id = await self._get_chat_channel_id()
-            if not chat_channel_id:
-                self.error.emit("라이브 중이 아니거나, chatChannelId를 찾을 수 없습니다.")
-                return
-
-            # 파일 열기 (저장 옵션이 활성화된 경우)
-            if self.save_to_file:
-                self.file_handle = open(self.file_path, "a", encoding="utf-8")
-
-            # 웹소켓 연결 (재연결 로직 포함)
-            while self.running:
-                try:
-                    await self._connect_to_websocket(chat_channel_id)
-                except Exception as e:
-                    if self.running:
-                        self.status_message.emit(f"연결 끊김. 5초 후 재연결... ({e})")
-                        await asyncio.sleep(5)
-                    else:
-                        break
-
-        finally:
-            if self.file_handle:
-                self.file_handle.close()
+        # stop()은 _loop가 보이면 _task를 쓰므로, 작업을 먼저 기록하고 루프를 마지막에 공개합니다.
+        self._task = asyncio.current_task()
+        self._loop = asyncio.get_running_loop()
+
+        # 라이브 상태 API 요청에 쓰는 세션은 워커가 끝날 때까지 재사용합니다.
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=4, ttl_dns_cache=300)
+        ) as self._http:
+            try:
+                # chatChannelId 가져오기
+                chat_channel_id = await self._get_chat_channel_id()
+                if not chat_channel_id:
+                    self.signals.error.emit(
+                        "라이브 중이 아니거나, chatChannelId를 찾을 수 없습니다."
+                    )
+                    return
+
+                # 파일 열기 (저장 옵션이 활성화된 경우)
+                # 메시지마다 flush하지 않고 버퍼에 모아 두었다가 주기적으로 기록합니다.
+                if self.save_to_file:
+                    self.file_handle = open(self.file_path, "ab", buffering=1 << 16)
+                    flush_task = asyncio.create_task(self._periodic_flush())
+
+                # 웹소켓 연결 (재연결 로직 포함)
+                while self.running:
+                    try:
+                        await self._connect_to_websocket(chat_channel_id)
+                    except Exception as e:
+                        if self.running:
+                            self.signals.status_message.emit(
+                                f"연결 끊김. 5초 후 재연결... ({e})"
+                            )
+                            await asyncio.sleep(5)
+                            # 방송이 바뀌었으면 새 채팅 채널로 다시 연결합니다.
+                            chat_channel_id = (
+                                await self._get_chat_channel_id() or chat_channel_id
+                            )
+                        else:
+                            break
+
+            finally:
+                if self.file_handle:
+                    flush_task.cancel()
+                    self.file_handle.close()
+
+    async def _periodic_flush(self):
+        """
+        2초마다 채팅 로그 버퍼를 파일에 기록합니다. (디스크 지연이 이벤트 루프를 막지 않도록 스레드에서 실행)
+        """
+        while True:
+            await asyncio.sleep(2)
+            await asyncio.to_thread(self.file_handle.flush)
 
     async def _get_chat_channel_id(self):
         """
@@ -216,14 +702,13 @@ class ChatWorker(QObject):
         api_url = f"https://api.chzzk.naver.com/polling/v2/channels/{self.channel_id}/live-status"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url) as response:
-                    response.raise_for_status()
-                    data = await response.json()
-                    content = data.get("content", {})
-                    return content.get("chatChannelId")
+            async with self._http.get(api_url) as response:
+                response.raise_for_status()
+                data = await response.json()
+                content = data.get("content") or {}
+                return content.get("chatChannelId")
         except Exception as e:
-            self.error.emit(f"API 요청 중 오류: {e}")
+            self.signals.error.emit(f"API 요청 중 오류: {e}")
             return None
 
     async def _connect_to_websocket(self, chat_channel_id):
@@ -231,45 +716,35 @@ class ChatWorker(QObject):
         웹소켓에 연결하여 채팅을 수신합니다.
         """
         uri = f"wss://kr-ss{random.randint(1, 10)}.chat.naver.com/chat"
-        self.status_message.emit(f"웹소켓 연결 중: {uri}")
+        self.signals.status_message.emit(f"웹소켓 연결 중: {uri}")
 
         async with websockets.connect(
             uri,
             user_agent_header="Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:140.0) Gecko/20100101 Firefox/140.0",
             origin="https://chzzk.naver.com",
+            # 작은 JSON 텍스트 프레임뿐이므로 프레임마다 zlib 압축 해제를 하지 않습니다.
+            compression=None,
+            max_size=2**20,
         ) as websocket:
-            self.status_message.emit("✅ 웹소켓 연결 성공")
+            self.signals.status_message.emit("✅ 웹소켓 연결 성공")
 
             # 초기 연결 메시지
-            connect_message = {
-                "ver": "3",
-                "cmd": 100,
-                "svcid": "game",
-                "cid": chat_channel_id,
-                "bdy": {
-                    "uid": None,
-                    "devType": 2001,
-                    "accTkn": "",
-                    "auth": "READ",
-                    "libVer": "4.9.3",
-                    "osVer": "Windows/10",
-                    "devName": "Mozilla Firefox/140.0",
-                    "locale": "ko-KR",
-                    "timezone": "Asia/Seoul",
-                },
-                "tid": 1,
-            }
-            await websocket.send(json.dumps(connect_message))
-            await websocket.recv()  # 첫 번째 응답 무시
+            await websocket.send(handshake_frame(chat_channel_id), text=True)
+            await websocket.recv(decode=False)  # 첫 번째 응답 무시
 
             # 채팅 수신 루프
             while self.running:
-                message_str = await websocket.recv()
-                message = json.loads(message_str)
+                # 서버는 UTF-8 JSON만 보내므로 디코딩/검증 없이 bytes 그대로 파싱합니다.
+                message_str = await websocket.recv(decode=False)
+                message = json_loads(message_str)
 
                 # 서버 PING 메시지에 대한 PONG 응답
                 if message.get("cmd") == 0:
-                    await websocket.send('{"ver": "2", "cmd": 10000}')
+                    await websocket.send(PONG_FRAME, text=True)
+                    continue
+
+                # 채팅/후원 이외의 프레임(최근 채팅 목록 등)은 건너뜁니다.
+                if message.get("cmd") not in CHAT_COMMANDS:
                     continue
 
                 # 채팅 메시지 처리
@@ -281,61 +756,77 @@ class ChatWorker(QObject):
         """
         개별 채팅 메시지를 처리합니다.
         """
-        try:
-            msg_time_ms = chat.get("msgTime")
-            msg = chat.get("msg")
+        msg_time_ms = chat.get("msgTime")
+        msg = chat.get("msg")
 
-            if not msg_time_ms or not msg:
-                return
+        if not msg_time_ms or not msg:
+            return
 
-            profile_json = json.loads(chat.get("profile", "{}"))
+        try:
+            # 익명 후원은 profile이 null로 내려옵니다.
+            profile = chat.get("profile")
+            profile_json = json_loads(profile) if profile else {}
             nickname = profile_json.get("nickname", "익명")
 
-            extras_json = json.loads(chat.get("extras", "{}"))
+            extras = chat.get("extras")
+            extras_json = json_loads(extras) if extras else {}
             os_type = extras_json.get("osType")
             pay_amount = extras_json.get("payAmount")
+        except ValueError:
+            self.signals.status_message.emit(f"채팅 파싱 오류: {chat}")
+            return
 
-            # 타임스탬프 포맷팅
-            dt_object = datetime.datetime.fromtimestamp(msg_time_ms / 1000)
-            formatted_time = dt_object.strftime("%Y-%m-%d %H:%M:%S")
-            os_info = f" ({os_type})" if os_type else ""
+        # 타임스탬프 포맷팅
+        formatted_time = format_time(msg_time_ms // 1000)
+        os_info = f" ({os_type})" if os_type else ""
 
-            # 메시지 포맷팅
-            if pay_amount and pay_amount > 0:
-                log_message = f"[{formatted_time}] {nickname}{os_info} ({pay_amount}원 후원): {msg}"
-            else:
-                log_message = f"[{formatted_time}] {nickname}{os_info}: {msg}"
-
-            # 채팅 표시
-            self.chat_message.emit(log_message)
+        # 메시지 포맷팅
+        if pay_amount and pay_amount > 0:
+            log_message = (
+                f"[{formatted_time}] {nickname}{os_info} ({pay_amount}원 후원): {msg}"
+            )
+        else:
+            log_message = f"[{formatted_time}] {nickname}{os_info}: {msg}"
 
-            # 파일 저장
-            if self.file_handle:
-                self.file_handle.write(log_message + "\n")
-                self.file_handle.flush()
+        # 채팅 표시
+        self.signals.chat_message.emit(log_message)
 
-        except Exception:
-            pass
+        # 파일 저장
+        if self.file_handle:
+            self.file_handle.write((log_message + "\n").encode())
 
     def stop(self):
         """
         채팅 수신을 중지합니다.
         """
         self.running = False
-
+        # 웹소켓 수신이나 재연결 대기 중이어도 바로 끝나도록 워커 루프에서 작업을 취소합니다.
+        if self._loop:
+            try:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+            except RuntimeError:
+                pass  # 이벤트 루프가 이미 종료됨
 
 
 class MainWindow(FluentWindow):
     def __init__(self):
         super().__init__()
-        self.worker = None
-        self.thread = None
+        self.workers = []
+        # URL별로 추출한 비디오 정보 {URL: (저장 시각, 정보)} (다시 받을 때 재사용)
+        self.info_cache = {}
         self.chat_worker = None
-        self.chat_thread = None
+        # 다운로드 전용 스레드 풀 (동시에 실행할 다운로드 수만큼만 스레드를 씁니다)
+        self.download_pool = QThreadPool(self)
+        # 채팅 뷰어 전용 스레드 풀 (창을 닫을 때 이 풀만 정리하고 기다립니다)
+        self.chat_pool = QThreadPool(self)
+        self.chat_pool.setMaxThreadCount(1)
         self.setWindowTitle("Video Downloader & Chat Viewer")
         self.setWindowIcon(QIcon("logo.ico"))
         self.setGeometry(100, 100, 800, 600)
 
+        # 위젯을 모두 만든 뒤 한 번만 다시 그리도록 그동안 화면 갱신을 멈춥니다.
+        self.setUpdatesEnabled(False)
+
         # 다운로더 탭 생성
         self.create_downloader_tab()
         
@@ -346,11 +837,7 @@ class MainWindow(FluentWindow):
         self.addSubInterface(self.downloader_widget, FluentIcon.DOWNLOAD, "다운로더")
         self.addSubInterface(self.chat_widget, FluentIcon.CHAT, "채팅 뷰어")
 
-        # Redirect stdout/stderr to status output
-        sys.stdout = Stream()
-        sys.stdout.new_text.connect(self.update_download_status)
-        sys.stderr = Stream()
-        sys.stderr.new_text.connect(self.update_download_status)
+        self.setUpdatesEnabled(True)
 
     def create_downloader_tab(self):
         """다운로더 탭을 생성합니다."""
@@ -364,8 +851,11 @@ class MainWindow(FluentWindow):
         input_card = CardWidget()
         input_layout = QVBoxLayout(input_card)
 
-        self.url_input = LineEdit()
-        self.url_input.setPlaceholderText("다운로드할 비디오 또는 스트림의 URL")
+        self.url_input = PlainTextEdit()
+        self.url_input.setPlaceholderText(
+            "다운로드할 비디오 또는 스트림의 URL (한 줄에 하나씩)"
+        )
+        self.url_input.setMaximumHeight(100)
         input_layout.addWidget(BodyLabel(text="비디오 URL"))
         input_layout.addWidget(self.url_input)
 
@@ -392,22 +882,68 @@ class MainWindow(FluentWindow):
         cookies_layout.addWidget(self.cookies_label)
         options_layout.addLayout(cookies_layout)
 
+        # Output Directory Option
+        output_dir_layout = QHBoxLayout()
+        self.output_dir_button = PrimaryPushButton(text="저장 폴더 선택")
+        self.output_dir_label = LineEdit()
+        self.output_dir_label.setPlaceholderText("저장 폴더 (기본: 현재 폴더)")
+        self.output_dir_label.setReadOnly(True)
+        output_dir_layout.addWidget(self.output_dir_button)
+        output_dir_layout.addWidget(self.output_dir_label)
+        options_layout.addLayout(output_dir_layout)
+
         main_layout.addWidget(options_card)
 
         # --- Download Button ---
+        download_layout = QHBoxLayout()
         self.download_button = PrimaryPushButton(text="다운로드")
         self.download_button.setMinimumHeight(40)
-        main_layout.addWidget(self.download_button)
+        self.fragments_spinbox = SpinBox()
+        self.fragments_spinbox.setRange(1, 16)
+        self.fragments_spinbox.setValue(5)
+        self.fragments_spinbox.setToolTip(
+            "HLS/DASH 조각을 동시에 받을 개수입니다. (yt-dlp -N)"
+        )
+        self.connections_spinbox = SpinBox()
+        self.connections_spinbox.setRange(1, 16)
+        self.connections_spinbox.setValue(16)
+        self.connections_spinbox.setToolTip(
+            "aria2c가 파일 하나에 여는 연결 수입니다. (aria2c -x/-s)\n"
+            "연결이 많을수록 느려지는 서버에서는 값을 줄이세요."
+        )
+        self.parallel_spinbox = SpinBox()
+        self.parallel_spinbox.setRange(1, 8)
+        self.parallel_spinbox.setValue(3)
+        self.parallel_spinbox.setToolTip("여러 URL을 동시에 다운로드할 개수입니다.")
+        download_layout.addWidget(self.download_button, 1)
+        download_layout.addWidget(BodyLabel(text="동시 다운로드"))
+        download_layout.addWidget(self.parallel_spinbox)
+        download_layout.addWidget(BodyLabel(text="동시 조각"))
+        download_layout.addWidget(self.fragments_spinbox)
+        download_layout.addWidget(BodyLabel(text="연결 수"))
+        download_layout.addWidget(self.connections_spinbox)
+        main_layout.addLayout(download_layout)
 
         # --- Status Area ---
         status_card = CardWidget()
         status_layout = QVBoxLayout(status_card)
         self.status_output = TextEdit()
         self.status_output.setReadOnly(True)
+        # 오래된 로그는 버려서 긴 다운로드 중에도 문서가 끝없이 커지지 않게 합니다.
+        self.status_output.document().setMaximumBlockCount(2000)
+        # 읽기 전용 로그이므로 줄바꿈 계산과 실행 취소 기록을 하지 않습니다.
+        self.status_output.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        self.status_output.setUndoRedoEnabled(False)
         status_layout.addWidget(BodyLabel(text="상태"))
         status_layout.addWidget(self.status_output)
         main_layout.addWidget(status_card, 1)  # Stretch status card
 
+        # 상태 메시지는 모아 두었다가 100ms에 한 번만 화면에 추가합니다.
+        self.status_buffer = deque()
+        self.status_flush_timer = QTimer(self)
+        self.status_flush_timer.setInterval(100)
+        self.status_flush_timer.timeout.connect(self.flush_status_buffer)
+
         # --- Theme Switcher ---
         theme_layout = QHBoxLayout()
         theme_layout.setAlignment(Qt.AlignmentFlag.AlignRight)
@@ -421,6 +957,7 @@ class MainWindow(FluentWindow):
         # Signals and Slots
         self.download_button.clicked.connect(self.start_download)
         self.cookies_button.clicked.connect(self.browse_cookies)
+        self.output_dir_button.clicked.connect(self.browse_output_dir)
         self.theme_switch.checkedChanged.connect(self.toggle_theme)
 
     def create_chat_viewer_tab(self):
@@ -479,6 +1016,9 @@ class MainWindow(FluentWindow):
         chat_layout = QVBoxLayout(chat_card)
         self.chat_output = TextEdit()
         self.chat_output.setReadOnly(True)
+        # 오래된 채팅은 버려서 문서가 끝없이 커지지 않게 합니다.
+        self.chat_output.document().setMaximumBlockCount(5000)
+        self.chat_output.setUndoRedoEnabled(False)
         chat_layout.addWidget(BodyLabel(text="채팅"))
         chat_layout.addWidget(self.chat_output)
         main_layout.addWidget(chat_card, 1)  # Stretch chat card
@@ -488,6 +1028,8 @@ class MainWindow(FluentWindow):
         status_layout = QVBoxLayout(status_card)
         self.chat_status_output = TextEdit()
         self.chat_status_output.setReadOnly(True)
+        self.chat_status_output.document().setMaximumBlockCount(2000)
+        self.chat_status_output.setUndoRedoEnabled(False)
         self.chat_status_output.setMaximumHeight(80)
         status_layout.addWidget(BodyLabel(text="상태"))
         status_layout.addWidget(self.chat_status_output)
@@ -498,35 +1040,69 @@ class MainWindow(FluentWindow):
         self.stop_chat_button.clicked.connect(self.stop_chat_viewer)
         self.chat_file_button.clicked.connect(self.browse_chat_file)
 
+        # 채팅은 모아 두었다가 한 프레임(33ms)에 한 번만 화면에 추가합니다.
+        self.chat_buffer = deque(maxlen=10000)
+        self.chat_flush_timer = QTimer(self)
+        self.chat_flush_timer.setInterval(33)
+        self.chat_flush_timer.timeout.connect(self.flush_chat_buffer)
+
     @Slot()
     def start_download(self):
-        video_url = self.url_input.text()
-        if not video_url:
+        video_urls = [
+            url.strip()
+            for url in self.url_input.toPlainText().splitlines()
+            if url.strip()
+        ]
+        if not video_urls:
             self.update_download_status("비디오 URL을 입력하세요.")
             return
 
         self.download_button.setEnabled(False)
+        self.status_buffer.clear()
         self.status_output.clear()
-        self.update_download_status("다운로드를 준비 중입니다...")
-
-        self.thread = QThread()
-        self.worker = Worker(
-            video_url=video_url,
-            live=self.live_checkbox.isChecked(),
-            cookies_file=self.cookies_label.text() or None,
+        self.update_download_status(
+            f"{len(video_urls)}개의 다운로드를 준비 중입니다..."
         )
-        self.worker.moveToThread(self.thread)
-
-        self.thread.started.connect(self.worker.run)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.thread.finished.connect(lambda: self.download_button.setEnabled(True))
 
-        self.worker.progress.connect(self.update_download_status)
-        self.worker.error.connect(self.update_download_status)
-
-        self.thread.start()
+        # 여러 다운로드의 메시지가 섞이므로 몇 번째 URL인지 앞에 붙입니다.
+        if len(video_urls) == 1:
+            labels = [""]
+        else:
+            labels = [f"[{i}] " for i in range(1, len(video_urls) + 1)]
+        jobs = [
+            (label, url, self.cached_info(url))
+            for label, url in zip(labels, video_urls)
+        ]
+
+        # 동시 다운로드 수만큼 프로세스를 띄우고, 각 프로세스는 YoutubeDL 하나로
+        # 공유 큐에서 URL을 하나씩 꺼내 받습니다. (프로세스마다 끝 표시 None을 하나씩 넣음)
+        lane_count = min(self.parallel_spinbox.value(), len(jobs))
+        job_queue = MP_CONTEXT.Queue()
+        for job in jobs:
+            job_queue.put(job)
+        for _ in range(lane_count):
+            job_queue.put(None)
+        self.download_pool.setMaxThreadCount(lane_count)
+        # 진행 상황은 스레드 풀에서 emit되므로, 워커가 UI를 기다리지 않도록 큐로 넘깁니다.
+        queued = Qt.ConnectionType.QueuedConnection
+        for _ in range(lane_count):
+            worker = Worker(
+                job_queue=job_queue,
+                live=self.live_checkbox.isChecked(),
+                cookies_file=self.cookies_label.text() or None,
+                fragments=self.fragments_spinbox.value(),
+                connections=self.connections_spinbox.value(),
+                output_dir=self.output_dir_label.text() or ".",
+                lanes=lane_count,
+            )
+            worker.signals.finished.connect(
+                lambda worker=worker: self.on_download_finished(worker), queued
+            )
+            worker.signals.progress.connect(self.update_download_status, queued)
+            worker.signals.error.connect(self.update_download_status, queued)
+            worker.signals.info.connect(self.store_info, queued)
+            self.workers.append(worker)
+            self.download_pool.start(worker)
 
     @Slot()
     def start_chat_viewer(self):
@@ -538,28 +1114,50 @@ class MainWindow(FluentWindow):
         self.start_chat_button.setEnabled(False)
         self.stop_chat_button.setEnabled(True)
         self.chat_output.clear()
+        self.chat_buffer.clear()
         self.chat_status_output.clear()
         self.update_chat_status("채팅 뷰어를 시작합니다...")
 
-        self.chat_thread = QThread()
         self.chat_worker = ChatWorker(
             channel_id=channel_id,
             save_to_file=self.save_chat_checkbox.isChecked(),
             file_path=self.chat_file_label.text() or "chat.txt",
         )
-        self.chat_worker.moveToThread(self.chat_thread)
-
-        self.chat_thread.started.connect(self.chat_worker.run)
-        self.chat_worker.finished.connect(self.chat_thread.quit)
-        self.chat_worker.finished.connect(self.chat_worker.deleteLater)
-        self.chat_thread.finished.connect(self.chat_thread.deleteLater)
-        self.chat_thread.finished.connect(self.on_chat_finished)
-
-        self.chat_worker.chat_message.connect(self.update_chat_message)
-        self.chat_worker.status_message.connect(self.update_chat_status)
-        self.chat_worker.error.connect(self.update_chat_status)
-
-        self.chat_thread.start()
+        self.chat_worker.signals.finished.connect(self.on_chat_finished)
+        self.chat_worker.signals.chat_message.connect(self.update_chat_message)
+        self.chat_worker.signals.status_message.connect(self.update_chat_status)
+        self.chat_worker.signals.error.connect(self.update_chat_status)
+
+        self.chat_flush_timer.start()
+        self.chat_pool.start(self.chat_worker)
+
+    def cached_info(self, video_url):
+        """저장한 지 INFO_CACHE_TTL이 지나지 않은 비디오 정보를 반환합니다."""
+        cached = self.info_cache.get(video_url)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] > INFO_CACHE_TTL:
+            del self.info_cache[video_url]
+            return None
+        return cached[1]
+
+    @Slot(str, object)
+    def store_info(self, video_url, info):
+        now = time.monotonic()
+        # 다시 요청되지 않은 URL의 정보가 계속 남지 않도록 저장할 때 만료된 항목을 지웁니다.
+        expired = [
+            url
+            for url, (stored_at, _) in self.info_cache.items()
+            if now - stored_at > INFO_CACHE_TTL
+        ]
+        for url in expired:
+            del self.info_cache[url]
+        self.info_cache[video_url] = (now, info)
+
+    def on_download_finished(self, worker):
+        self.workers.remove(worker)
+        if not self.workers:
+            self.download_button.setEnabled(True)
 
     @Slot()
     def stop_chat_viewer(self):
@@ -568,8 +1166,18 @@ class MainWindow(FluentWindow):
             self.chat_worker.stop()
             self.stop_chat_button.setEnabled(False)
 
+    def closeEvent(self, event):
+        # 채팅 워커가 수신 중이면 멈추고, 끝날 때까지 잠시 기다린 뒤 창을 닫습니다.
+        if self.chat_worker:
+            self.chat_worker.stop()
+        self.chat_pool.waitForDone(3000)
+        super().closeEvent(event)
+
     @Slot()
     def on_chat_finished(self):
+        self.chat_worker = None
+        self.chat_flush_timer.stop()
+        self.flush_chat_buffer()
         self.start_chat_button.setEnabled(True)
         self.stop_chat_button.setEnabled(False)
         self.update_chat_status("채팅 뷰어가 중지되었습니다.")
@@ -582,6 +1190,12 @@ class MainWindow(FluentWindow):
         if file_path:
             self.cookies_label.setText(file_path)
 
+    @Slot()
+    def browse_output_dir(self):
+        dir_path = QFileDialog.getExistingDirectory(self, "저장 폴더 선택")
+        if dir_path:
+            self.output_dir_label.setText(dir_path)
+
     @Slot()
     def browse_chat_file(self):
         file_path, _ = QFileDialog.getSaveFileName(
@@ -592,11 +1206,28 @@ class MainWindow(FluentWindow):
 
     @Slot(str)
     def update_download_status(self, text):
-        self.status_output.append(text.strip())
+        self.status_buffer.append(text.strip())
+        if not self.status_flush_timer.isActive():
+            self.status_flush_timer.start()
+
+    @Slot()
+    def flush_status_buffer(self):
+        # 쌓인 메시지가 없으면 다음 메시지가 올 때까지 타이머를 쉬게 합니다.
+        if self.status_buffer:
+            self.status_output.append("\n".join(self.status_buffer))
+            self.status_buffer.clear()
+        else:
+            self.status_flush_timer.stop()
 
     @Slot(str)
     def update_chat_message(self, text):
-        self.chat_output.append(text.strip())
+        self.chat_buffer.append(text.strip())
+
+    @Slot()
+    def flush_chat_buffer(self):
+        if self.chat_buffer:
+            self.chat_output.append("\n".join(self.chat_buffer))
+            self.chat_buffer.clear()
 
     @Slot(str)
     def update_chat_status(self, text):
@@ -613,6 +1244,8 @@ class MainWindow(FluentWindow):
 
 
 if __name__ == "__main__":
+    # 패키징된 실행 파일에서 다운로드 프로세스를 띄울 수 있도록 합니다.
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     setTheme(Theme.AUTO)
     window = MainWindow()